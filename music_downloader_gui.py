@@ -10,6 +10,28 @@ import base64
 import time
 import re
 import csv
+import sys
+import signal
+import shutil
+import argparse
+import cProfile
+import tracemalloc
+import dis
+import html
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+# psutil is optional; it enables pausing and I/O priority on Windows
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# yt-dlp is optional; it enables pre-expanding YouTube playlists and channels
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
 
 # --- Configuration & Constants ---
 CONFIG_FILE = "config.json"
@@ -20,6 +42,599 @@ SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 SPOTIFY_API_URL = "https://api.spotify.com/v1"
 OBSCURIFY_RECOMMENDATIONS_URL = "https://obscurifymusic.com/recommendations"
 DEFAULT_DOWNLOAD_PATH = os.path.join(os.path.expanduser("~"), "Downloads", "slsk-batchdl")
+NEGATIVE_CACHE_FILE = "negative_cache.json"
+DEFAULT_NEGATIVE_CACHE_TTL_HOURS = 24
+NEGATIVE_CACHE_MAX_INTERVAL_HOURS = 24 * 30 # Never wait more than a month before re-checking a track
+SEARCH_HISTORY_FILE = "search_history.json"
+DEFAULT_ALBUM_GROUP_MIN_TRACKS = 3
+TRACK_NUMBER_PREFIX = re.compile(r'^\s*(?:\d{1,2}[\-.])?\d{1,3}[\s.\-_)]+') # One track number, optionally with disc: "01 - ", "1-02. ", "3) "
+BUSINESS_HOURS = (9, 18) # Start and end hour (Mon-Fri) during which resource limits apply in full
+PROCESS_LIMITS_CHECK_INTERVAL = 60 # Seconds between re-evaluating time-of-day resource limits
+IO_PRIORITIES = ["normal", "low", "idle"]
+PLAYLIST_KEY_PREFIX = "#SLDL-TRACK:" # M3U comment holding the source track key of the entry below it
+EXPANSION_CACHE_FILE = "expansion_cache.json"
+EXPANSION_CACHE_TTL_HOURS = 24
+EXPANSION_WORKERS = 8 # Concurrent page/playlist fetches while expanding a source
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.01 # Seconds between stack samples of the Tk main loop and worker threads
+PROFILE_MAX_STACKS = 20000 # Distinct sampled stacks kept per job; further new stacks are counted together
+
+# --- Helper Functions ---
+
+def normalize_text(text):
+    """
+    Lowercases the text and collapses quotes and whitespace.
+    Used for every comparison key: cache and history entries, playlist keys and album matching.
+    """
+    return " ".join(text.replace('"', '').lower().split())
+
+# --- Helper Classes ---
+
+class NegativeSearchCache:
+    """
+    Persistent cache of searches that returned "No files found".
+    Entries are keyed by the normalized query plus the search options used, and each
+    consecutive miss doubles the re-check interval (up to a maximum).
+    """
+    def __init__(self, file_path=NEGATIVE_CACHE_FILE):
+        self.file_path = file_path
+        self.max_interval_seconds = NEGATIVE_CACHE_MAX_INTERVAL_HOURS * 3600
+        self.entries = {}
+        self.load()
+
+    def make_key(self, query, options_signature):
+        """Builds the cache key for a query searched with the given options."""
+        return f"{normalize_text(query)}|{options_signature}"
+
+    def load(self):
+        """Loads the cache from disk, starting empty if the file is missing or unreadable."""
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def save(self):
+        """Writes the cache to disk, dropping entries whose back-off has fully expired."""
+        now = time.time()
+        self.entries = {
+            key: entry for key, entry in self.entries.items()
+            if entry.get("retry_after", 0) + self.max_interval_seconds > now
+        }
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=4)
+
+    def is_suppressed(self, query, options_signature, ttl_hours=DEFAULT_NEGATIVE_CACHE_TTL_HOURS):
+        """Returns True if the query is known-missing and still inside its re-check interval."""
+        if ttl_hours <= 0:
+            return False
+        entry = self.entries.get(self.make_key(query, options_signature))
+        return entry is not None and entry.get("retry_after", 0) > time.time()
+
+    def record_miss(self, query, options_signature, ttl_hours=DEFAULT_NEGATIVE_CACHE_TTL_HOURS):
+        """Records a "No files found" result and schedules the next re-check with exponential back-off."""
+        if ttl_hours <= 0:
+            return
+        key = self.make_key(query, options_signature)
+        now = time.time()
+        misses = self.entries.get(key, {}).get("misses", 0) + 1
+        interval = min(ttl_hours * 3600 * (2 ** (misses - 1)), self.max_interval_seconds)
+        self.entries[key] = {
+            "query": query,
+            "misses": misses,
+            "last_checked": now,
+            "retry_after": now + interval
+        }
+
+    def record_hit(self, query, options_signature):
+        """Forgets a query once it has been found."""
+        self.entries.pop(self.make_key(query, options_signature), None)
+
+class TrackTable:
+    """
+    Compact columnar store for every track seen in a session.
+    Tracks are referred to everywhere by their integer ID (the row index) instead of
+    repeated strings, and artist/album names are interned since large libraries repeat them.
+    """
+    def __init__(self):
+        self.titles = []
+        self.artists = []
+        self.albums = []
+        self.queries = [] # Search query generated for each track, "" until known
+        self.lock = threading.Lock() # Several jobs can be pre-processed at once
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title, artist, album=""):
+        """Adds a track and returns its ID."""
+        with self.lock:
+            self.titles.append(title)
+            self.artists.append(sys.intern(artist))
+            self.albums.append(sys.intern(album))
+            self.queries.append("")
+            return len(self.titles) - 1
+
+    def set_query(self, track_id, query):
+        """Stores the search query generated for a track."""
+        with self.lock:
+            self.queries[track_id] = query
+
+class ExpansionCache:
+    """
+    On-disk cache of YouTube/Bandcamp URLs expanded into track lists, with a TTL per entry.
+    """
+    def __init__(self, file_path=EXPANSION_CACHE_FILE, ttl_hours=EXPANSION_CACHE_TTL_HOURS):
+        self.file_path = file_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Loads the cache from disk, starting empty if the file is missing or unreadable."""
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, url):
+        """Returns (title, tracks) for a URL expanded within the TTL, or None."""
+        entry = self.entries.get(url)
+        if entry and entry.get("fetched", 0) + self.ttl_seconds > time.time():
+            return entry["title"], entry["tracks"]
+        return None
+
+    def put(self, url, title, tracks):
+        """Stores an expansion and writes the cache, dropping expired entries."""
+        with self.lock:
+            now = time.time()
+            self.entries = {
+                key: entry for key, entry in self.entries.items()
+                if entry.get("fetched", 0) + self.ttl_seconds > now
+            }
+            self.entries[url] = {"fetched": now, "title": title, "tracks": tracks}
+            with open(self.file_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=4)
+
+class SearchHistory:
+    """
+    Persistent record of past search outcomes, used to put likely quick hits first.
+    Keeps per-artist hit/miss counts and time-to-find, plus per-query not-found counts.
+    """
+    def __init__(self, file_path=SEARCH_HISTORY_FILE):
+        self.file_path = file_path
+        self.artists = {}
+        self.queries = {}
+        self.load()
+
+    def load(self):
+        """Loads the history from disk, starting empty if the file is missing or unreadable."""
+        if os.path.exists(self.file_path):
+            try:
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                    self.artists = data.get("artists", {})
+                    self.queries = data.get("queries", {})
+            except (OSError, ValueError):
+                self.artists = {}
+                self.queries = {}
+
+    def save(self):
+        """Writes the history to disk."""
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            json.dump({"artists": self.artists, "queries": self.queries}, f, indent=4)
+
+    def record(self, query, artist, found, elapsed_seconds=None):
+        """Records whether a query was found and, for hits, roughly how long it took."""
+        artist_stats = self.artists.setdefault(normalize_text(artist), {"hits": 0, "misses": 0, "find_seconds": 0.0})
+        query_stats = self.queries.setdefault(normalize_text(query), {"found": 0, "not_found": 0})
+        if found:
+            artist_stats["hits"] += 1
+            artist_stats["find_seconds"] += elapsed_seconds or 0.0
+            query_stats["found"] += 1
+        else:
+            artist_stats["misses"] += 1
+            query_stats["not_found"] += 1
+
+    def score(self, query, artist):
+        """
+        Estimates how worthwhile it is to search a query early: the expected hit rate
+        divided by the expected time to find it. Unknown artists get a neutral score.
+        """
+        artist_stats = self.artists.get(normalize_text(artist), {})
+        hits = artist_stats.get("hits", 0)
+        misses = artist_stats.get("misses", 0)
+        hit_rate = (hits + 1) / (hits + misses + 2) # Laplace smoothing so one result doesn't dominate
+        avg_find_minutes = (artist_stats.get("find_seconds", 0.0) / hits / 60) if hits else 1.0
+        query_stats = self.queries.get(normalize_text(query), {})
+        if query_stats.get("found", 0) == 0:
+            hit_rate *= 0.5 ** query_stats.get("not_found", 0)
+        return hit_rate / (1 + avg_find_minutes)
+
+class PlaylistWriter:
+    """
+    Maintains an M3U8 playlist for one source playlist, in the source's track order.
+    Tracks are added as soon as they are confirmed downloaded or already on disk. Each entry
+    carries a comment with its track key, so the file itself records what is confirmed and
+    later, resumed or sharded runs extend it instead of rebuilding it from a folder scan.
+    """
+    def __init__(self, playlist_path, track_keys):
+        self.playlist_path = playlist_path
+        self.playlist_dir = os.path.dirname(playlist_path)
+        self.order = {}
+        for key in track_keys:
+            self.order.setdefault(key, len(self.order))
+        self.entries = {} # Track key -> (display name, file path)
+        self.written_keys = []
+        self.needs_rewrite = False # Set when the source order changed since the file was written
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Reads the entries confirmed by earlier runs from the existing playlist file."""
+        if not os.path.exists(self.playlist_path):
+            return
+        file_keys = []
+        with open(self.playlist_path, "r", encoding="utf-8") as f:
+            key = None
+            display_name = ""
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith(PLAYLIST_KEY_PREFIX):
+                    key = line[len(PLAYLIST_KEY_PREFIX):]
+                elif line.startswith("#EXTINF:"):
+                    display_name = line.split(",", 1)[-1]
+                elif line and not line.startswith("#") and key:
+                    self.entries[key] = (display_name, line)
+                    file_keys.append(key)
+                    key = None
+        # Tracks dropped from the source playlist keep their place after the current ones
+        for key in self.entries:
+            self.order.setdefault(key, len(self.order))
+        self.written_keys = sorted(self.entries, key=self.order.get)
+        self.needs_rewrite = file_keys != self.written_keys
+
+    def confirm(self, key, display_name, file_path):
+        """
+        Adds a confirmed track. Appends to the file when the track comes after every entry
+        already written, and rewrites it only when the track has to be inserted earlier.
+        """
+        if os.path.isabs(file_path):
+            try:
+                file_path = os.path.relpath(file_path, self.playlist_dir)
+            except ValueError: # Different drive on Windows
+                pass
+        entry = (display_name, file_path)
+        with self.lock:
+            if self.entries.get(key) == entry:
+                return
+            self.order.setdefault(key, len(self.order))
+            # State is only updated once the file write succeeded, so a failed write is retried next time
+            if key in self.entries or self.needs_rewrite or (self.written_keys and self.order[key] < self.order[self.written_keys[-1]]):
+                entries = dict(self.entries)
+                entries[key] = entry
+                written_keys = sorted(entries, key=self.order.get)
+                self.rewrite(entries, written_keys)
+                self.entries = entries
+                self.written_keys = written_keys
+                self.needs_rewrite = False
+            else:
+                os.makedirs(self.playlist_dir, exist_ok=True)
+                is_new_file = not os.path.exists(self.playlist_path)
+                with open(self.playlist_path, "a", encoding="utf-8") as f:
+                    if is_new_file:
+                        f.write("#EXTM3U\n")
+                    f.write(self.format_entry(key, entry))
+                self.entries[key] = entry
+                self.written_keys.append(key)
+
+    def rewrite(self, entries, written_keys):
+        """Writes the whole playlist in source order."""
+        os.makedirs(self.playlist_dir, exist_ok=True)
+        with open(self.playlist_path, "w", encoding="utf-8") as f:
+            f.write("#EXTM3U\n")
+            for key in written_keys:
+                f.write(self.format_entry(key, entries[key]))
+
+    def format_entry(self, key, entry):
+        """Returns the M3U lines for one entry."""
+        display_name, file_path = entry
+        return f"{PLAYLIST_KEY_PREFIX}{key}\n#EXTINF:-1,{display_name}\n{file_path}\n"
+
+class JobProfiler:
+    """
+    Captures cProfile stats and tracemalloc snapshots per job phase, plus a periodic stack
+    sample of every thread (Tk main loop, sldl reader, pre-processing) for the whole job.
+    Everything is written to one folder per job, next to a copy of the job log.
+    """
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.phase_counter = 0
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.sampling = False
+        self.sampler_thread = None
+
+    def start(self):
+        """Starts memory tracing and the background stack sampler."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start()
+        self.sampling = True
+        self.sampler_thread = threading.Thread(target=self._sample_threads, name="profiler-sampler", daemon=True)
+        self.sampler_thread.start()
+
+    def stop(self):
+        """Stops sampling and memory tracing and writes the thread samples."""
+        self.sampling = False
+        if self.sampler_thread:
+            self.sampler_thread.join()
+        self.write_memory_snapshot("final")
+        tracemalloc.stop()
+        # Collapsed-stack format, readable by flamegraph.pl and speedscope
+        with open(os.path.join(self.output_dir, "thread_samples.txt"), "w", encoding="utf-8") as f:
+            for (thread_name, stack), count in sorted(self.samples.items(), key=lambda item: -item[1]):
+                frames = [f"{name} ({os.path.basename(filename)}:{lineno})" for name, filename, lineno in stack]
+                f.write(f"{';'.join([thread_name] + frames)} {count}\n")
+
+    def run_phase(self, name, func, *args):
+        """Runs func under cProfile and saves its stats and a memory snapshot as a numbered phase."""
+        with self.lock:
+            self.phase_counter += 1
+            phase_name = f"{self.phase_counter:02d}_{name}"
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows only one active cProfile at a time; overlapping phases rely on the sampler
+            profile = None
+        try:
+            return func(*args)
+        finally:
+            if profile:
+                profile.disable()
+                profile.dump_stats(os.path.join(self.output_dir, f"{phase_name}.prof"))
+            self.write_memory_snapshot(phase_name)
+
+    def write_memory_snapshot(self, phase_name):
+        """Dumps a tracemalloc snapshot and a readable top-allocations list."""
+        if not tracemalloc.is_tracing():
+            return
+        # Leave out the sampler's own allocations (its sample table) and tracemalloc's
+        sampler_code = self._sample_threads.__code__
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)] +
+            [tracemalloc.Filter(False, sampler_code.co_filename, lineno) for _, lineno in dis.findlinestarts(sampler_code) if lineno]
+        )
+        snapshot.dump(os.path.join(self.output_dir, f"{phase_name}.tracemalloc"))
+        with open(os.path.join(self.output_dir, f"{phase_name}_memory.txt"), "w", encoding="utf-8") as f:
+            for stat in snapshot.statistics("lineno")[:50]:
+                f.write(f"{stat}\n")
+
+    def _sample_threads(self):
+        """
+        Periodically records the current stack of every other thread as raw
+        (function, file, line) tuples; they are only formatted when the job stops.
+        """
+        own_id = threading.get_ident()
+        overflow_key = ("(other stacks)", ())
+        while self.sampling:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, frame.f_lineno))
+                    frame = frame.f_back
+                stack.reverse()
+                key = (names.get(thread_id, str(thread_id)), tuple(stack))
+                if key not in self.samples and len(self.samples) >= PROFILE_MAX_STACKS:
+                    key = overflow_key
+                self.samples[key] = self.samples.get(key, 0) + 1
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+
+class ManagedProcess:
+    """
+    Handle on a running sldl process that supports pause, resume, cancel and priority limits.
+    Uses psutil when available and falls back to POSIX signals and os.setpriority.
+    """
+    def __init__(self, process):
+        self.process = process
+        self.paused = False
+        self.cancelled = False
+        self.applied_limits = None
+
+    def is_running(self):
+        """Returns True while the process has not exited."""
+        return self.process.poll() is None
+
+    def pause(self):
+        """Suspends the process. Returns False if this platform can't suspend it."""
+        if not self.is_running() or self.paused:
+            return False
+        if psutil:
+            psutil.Process(self.process.pid).suspend()
+        elif hasattr(signal, "SIGSTOP"):
+            os.kill(self.process.pid, signal.SIGSTOP)
+        else:
+            return False
+        self.paused = True
+        return True
+
+    def resume(self):
+        """Resumes a paused process."""
+        if not self.is_running() or not self.paused:
+            return False
+        if psutil:
+            psutil.Process(self.process.pid).resume()
+        elif hasattr(signal, "SIGCONT"):
+            os.kill(self.process.pid, signal.SIGCONT)
+        else:
+            return False
+        self.paused = False
+        return True
+
+    def cancel(self):
+        """Asks the process to terminate; output read so far is kept by the caller."""
+        if not self.is_running():
+            return
+        self.cancelled = True
+        # A stopped process can't handle the termination request
+        if self.paused:
+            self.resume()
+        self.process.terminate()
+
+    def apply_limits(self, nice_level, io_priority):
+        """
+        Sets the CPU nice level (0-19) and I/O priority ("normal", "low" or "idle").
+        Raising priority again usually needs elevated rights on POSIX, so failures are reported, not raised.
+        """
+        limits = (nice_level, io_priority)
+        if limits == self.applied_limits or not self.is_running():
+            return None
+        # Recorded before trying so a target that can't be reached is reported only once
+        self.applied_limits = limits
+        try:
+            if psutil:
+                proc = psutil.Process(self.process.pid)
+                if os.name == "nt":
+                    if nice_level >= 10:
+                        proc.nice(psutil.IDLE_PRIORITY_CLASS)
+                    elif nice_level > 0:
+                        proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+                    else:
+                        proc.nice(psutil.NORMAL_PRIORITY_CLASS)
+                    io_values = {"normal": psutil.IOPRIO_NORMAL, "low": psutil.IOPRIO_LOW, "idle": psutil.IOPRIO_VERYLOW}
+                    proc.ionice(io_values[io_priority])
+                else:
+                    proc.nice(nice_level)
+                    if hasattr(psutil, "IOPRIO_CLASS_BE"):
+                        io_values = {"normal": (psutil.IOPRIO_CLASS_BE, 4), "low": (psutil.IOPRIO_CLASS_BE, 7), "idle": (psutil.IOPRIO_CLASS_IDLE, 0)}
+                        io_class, io_value = io_values[io_priority]
+                        proc.ionice(io_class, io_value if io_class == psutil.IOPRIO_CLASS_BE else None)
+                    elif io_priority != "normal":
+                        return "I/O priority is not supported on this platform; only the CPU limit was applied."
+            elif hasattr(os, "setpriority"):
+                os.setpriority(os.PRIO_PROCESS, self.process.pid, nice_level)
+                # Without psutil, fall back to util-linux's ionice for the I/O priority
+                ionice = shutil.which("ionice")
+                if ionice:
+                    io_args = {"normal": ["-c", "2", "-n", "4"], "low": ["-c", "2", "-n", "7"], "idle": ["-c", "3"]}
+                    subprocess.run([ionice] + io_args[io_priority] + ["-p", str(self.process.pid)], check=True, capture_output=True)
+                elif io_priority != "normal":
+                    return "I/O priority needs psutil or the ionice command; only the CPU limit was applied."
+            else:
+                return "Process priority limits need psutil on this platform."
+        except Exception as e: # psutil raises its own AccessDenied/NoSuchProcess errors besides OSError
+            return f"Could not apply process limits: {e}"
+        return None
+
+class SldlSession:
+    """
+    Queues download jobs so only one sldl process runs at a time.
+    Each batch still starts a fresh sldl process and login; the saving comes from merging query
+    jobs that are waiting in the queue at the same time (same download path and limits) into one run.
+    The worker thread exits when the queue is empty and a new one starts with the next job.
+    """
+    MERGEABLE_INPUT_TYPES = ("list", "string")
+
+    def __init__(self, run_batch, on_idle, discard_job):
+        self.run_batch = run_batch # Called from the worker thread with a list of jobs to run as one sldl process
+        self.on_idle = on_idle # Called once no job is preparing, queued or running
+        self.discard_job = discard_job # Called with each job dropped by a cancel
+        self.lock = threading.Lock()
+        self.pending_jobs = []
+        self.preparing = 0
+        self.running = False
+        self.cancel_generation = 0 # Bumped by each cancel; jobs registered before it are dropped
+
+    def is_idle(self):
+        """Returns True if no job is being prepared, queued or run."""
+        with self.lock:
+            return not self.running and not self.pending_jobs and self.preparing == 0
+
+    def begin_prepare(self):
+        """
+        Registers a job whose input is still being pre-processed.
+        Returns the cancel generation to store in the job as "cancel_generation".
+        """
+        with self.lock:
+            self.preparing += 1
+            return self.cancel_generation
+
+    def end_prepare(self, job=None):
+        """
+        Finishes pre-processing of a job and queues it, starting the worker if needed.
+        Pass None if pre-processing failed or produced nothing to download.
+        """
+        dropped_job = None
+        with self.lock:
+            self.preparing -= 1
+            if job and job["cancel_generation"] != self.cancel_generation:
+                dropped_job = job
+            elif job:
+                self.pending_jobs.append(job)
+            start_worker = not self.running and bool(self.pending_jobs)
+            if start_worker:
+                self.running = True
+            now_idle = not self.running and self.preparing == 0
+        if dropped_job:
+            self.discard_job(dropped_job)
+        if start_worker:
+            threading.Thread(target=self._worker, name="sldl-session", daemon=True).start()
+        elif now_idle:
+            self.on_idle()
+
+    def cancel(self):
+        """
+        Drops every queued job, and every job still being pre-processed once it finishes.
+        Jobs started after the cancel are kept. The running batch is stopped by the caller.
+        """
+        with self.lock:
+            if not self.running and not self.pending_jobs and self.preparing == 0:
+                return
+            self.cancel_generation += 1
+            jobs = self.pending_jobs
+            self.pending_jobs = []
+        for job in jobs:
+            self.discard_job(job)
+
+    def can_merge(self, job):
+        """
+        Returns True if a job may share an sldl run with others.
+        --number/--offset would apply to the merged list as a whole, so jobs using them run alone.
+        """
+        return job["input_type"] in self.MERGEABLE_INPUT_TYPES and not job["options"]["number"] and not job["options"]["offset"]
+
+    def _take_batch(self):
+        """Pops the next job plus every queued job that can share its sldl run. Caller holds the lock."""
+        first = self.pending_jobs.pop(0)
+        batch = [first]
+        if self.can_merge(first):
+            for job in list(self.pending_jobs):
+                # Only jobs prepared with identical sldl options (including --write-playlist) share a run
+                if self.can_merge(job) and job["download_path"] == first["download_path"] and job["options"] == first["options"]:
+                    batch.append(job)
+                    self.pending_jobs.remove(job)
+        return batch
+
+    def _worker(self):
+        """Runs queued batches until the queue is empty."""
+        while True:
+            with self.lock:
+                if not self.pending_jobs:
+                    self.running = False
+                    now_idle = self.preparing == 0
+                    break
+                batch = self._take_batch()
+            self.run_batch(batch)
+        if now_idle:
+            self.on_idle()
 
 # --- UI Class ---
 
@@ -85,15 +700,47 @@ class App(ctk.CTk):
         self.download_button = ctk.CTkButton(self.footer_frame, text="Start Download", command=self.start_download, height=50, font=ctk.CTkFont(size=20, weight="bold"))
         self.download_button.grid(row=0, column=0, padx=20, pady=20, sticky="ew")
 
+        job_control_frame = ctk.CTkFrame(self.footer_frame, fg_color="transparent")
+        job_control_frame.grid(row=0, column=1, padx=20, pady=20, sticky="ew")
+        job_control_frame.grid_columnconfigure((0, 1), weight=1)
+        self.pause_button = ctk.CTkButton(job_control_frame, text="Pause", command=self.toggle_pause, height=50, state="disabled")
+        self.pause_button.grid(row=0, column=0, padx=5, sticky="ew")
+        self.cancel_button = ctk.CTkButton(job_control_frame, text="Cancel", command=self.cancel_download, height=50, state="disabled", fg_color="#a83232", hover_color="#7a2424")
+        self.cancel_button.grid(row=0, column=1, padx=5, sticky="ew")
+
         self.status_label = ctk.CTkLabel(self.footer_frame, text="Status: Ready", font=ctk.CTkFont(size=14))
         self.status_label.grid(row=1, column=0, columnspan=2, padx=20, pady=5, sticky="w")
         
         self.load_credentials()
         
-        # --- New: Lists to store download status ---
-        self.all_queries = []
-        self.downloaded_queries = set()
-        self.failed_downloads = []
+        # --- New: Lists to store download status (all refer to track IDs in the table) ---
+        self.track_table = TrackTable()
+        self.searched_ids = []
+        self.downloaded_ids = set()
+        self.failed_reasons = {}
+        self.skipped_ids = []
+        self.negative_cache = None
+        self.search_history = None
+        self.last_outcome_time = None
+        self.album_groups = [] # Album-level searches that stand in for several track searches
+        self.track_aliases = {} # Track ID -> IDs of same-job duplicates that share its search
+
+        # Handle on the running sldl process for pause/resume/cancel
+        self.current_process = None
+        self.job_cancelled = False
+
+        # Expanded YouTube/Bandcamp track lists, reused across runs
+        self.expansion_cache = ExpansionCache(EXPANSION_CACHE_FILE, EXPANSION_CACHE_TTL_HOURS)
+
+        # Playlist kept up to date for each track of a source playlist
+        self.track_playlists = {}
+
+        # Set while a profiled job is running
+        self.profiler = None
+
+        # Single sldl worker shared by all jobs; extra jobs are queued and merged
+        self.sldl_session = SldlSession(self.run_session_batch, self.finish_session, self.discard_job)
+        self.temp_file_counter = 0
 
     def create_input_section(self):
         """Creates the section for the input URL/path."""
@@ -168,6 +815,9 @@ class App(ctk.CTk):
         self.reverse_checkbox = ctk.CTkCheckBox(options_frame, text="Reverse Order")
         self.reverse_checkbox.grid(row=3, column=0, padx=10, pady=5, sticky="w")
         
+        self.history_order_checkbox = ctk.CTkCheckBox(options_frame, text="Likely Hits First")
+        self.history_order_checkbox.grid(row=3, column=3, padx=10, pady=5, sticky="w")
+        
         self.write_playlist_checkbox = ctk.CTkCheckBox(options_frame, text="Write M3U Playlist")
         self.write_playlist_checkbox.grid(row=3, column=1, padx=10, pady=5, sticky="w")
 
@@ -179,6 +829,39 @@ class App(ctk.CTk):
         listen_port_label.grid(row=4, column=0, padx=10, pady=5, sticky="w")
         self.listen_port_entry = ctk.CTkEntry(options_frame, placeholder_text="49998 (default)")
         self.listen_port_entry.grid(row=4, column=1, padx=10, pady=5, sticky="ew")
+        
+        # Row 5 (Album grouping)
+        self.album_group_checkbox = ctk.CTkCheckBox(options_frame, text="Group Album Searches (downloads whole albums)")
+        self.album_group_checkbox.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+        
+        album_group_label = ctk.CTkLabel(options_frame, text="Min Tracks per Album:")
+        album_group_label.grid(row=5, column=2, padx=10, pady=5, sticky="w")
+        self.album_group_entry = ctk.CTkEntry(options_frame, placeholder_text=str(DEFAULT_ALBUM_GROUP_MIN_TRACKS))
+        self.album_group_entry.grid(row=5, column=3, padx=10, pady=5, sticky="ew")
+        
+        # Row 6-7 (Resource limits)
+        nice_label = ctk.CTkLabel(options_frame, text="CPU Nice (0-19):")
+        nice_label.grid(row=6, column=0, padx=10, pady=5, sticky="w")
+        self.nice_entry = ctk.CTkEntry(options_frame, placeholder_text="0")
+        self.nice_entry.grid(row=6, column=1, padx=10, pady=5, sticky="ew")
+        
+        io_priority_label = ctk.CTkLabel(options_frame, text="I/O Priority:")
+        io_priority_label.grid(row=6, column=2, padx=10, pady=5, sticky="w")
+        self.io_priority_optionmenu = ctk.CTkOptionMenu(options_frame, values=IO_PRIORITIES)
+        self.io_priority_optionmenu.set("normal")
+        self.io_priority_optionmenu.grid(row=6, column=3, padx=10, pady=5, sticky="ew")
+        
+        concurrent_label = ctk.CTkLabel(options_frame, text="Max Concurrent Downloads:")
+        concurrent_label.grid(row=7, column=0, padx=10, pady=5, sticky="w")
+        self.concurrent_entry = ctk.CTkEntry(options_frame, placeholder_text="sldl default")
+        self.concurrent_entry.grid(row=7, column=1, padx=10, pady=5, sticky="ew")
+        
+        self.business_hours_checkbox = ctk.CTkCheckBox(options_frame, text=f"Limits only {BUSINESS_HOURS[0]}:00-{BUSINESS_HOURS[1]}:00 Mon-Fri")
+        self.business_hours_checkbox.grid(row=7, column=2, columnspan=2, padx=10, pady=5, sticky="w")
+        
+        # Row 8 (Diagnostics)
+        self.profile_checkbox = ctk.CTkCheckBox(options_frame, text="Profile Job (saved to profiles folder)")
+        self.profile_checkbox.grid(row=8, column=0, columnspan=2, padx=10, pady=5, sticky="w")
 
     def create_search_options_section(self):
         """Creates the section for search-related options."""
@@ -211,6 +894,9 @@ class App(ctk.CTk):
         self.yt_dlp_checkbox = ctk.CTkCheckBox(search_frame, text="Use yt-dlp as fallback")
         self.yt_dlp_checkbox.grid(row=2, column=2, padx=10, pady=5, sticky="w")
         
+        self.expand_sources_checkbox = ctk.CTkCheckBox(search_frame, text="Expand YouTube/Bandcamp")
+        self.expand_sources_checkbox.grid(row=2, column=3, padx=10, pady=5, sticky="w")
+        
         # Row 3 (Bitrate)
         min_bitrate_label = ctk.CTkLabel(search_frame, text="Min Bitrate:")
         min_bitrate_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
@@ -233,6 +919,12 @@ class App(ctk.CTk):
         self.format_entry = ctk.CTkEntry(search_frame, placeholder_text="flac,mp3")
         self.format_entry.grid(row=4, column=3, padx=10, pady=5, sticky="ew")
 
+        # Row 5 (Negative result cache)
+        negative_ttl_label = ctk.CTkLabel(search_frame, text="Not-found Re-check (hours):")
+        negative_ttl_label.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+        self.negative_ttl_entry = ctk.CTkEntry(search_frame, placeholder_text=f"{DEFAULT_NEGATIVE_CACHE_TTL_HOURS} (0 = off)")
+        self.negative_ttl_entry.grid(row=5, column=1, padx=10, pady=5, sticky="ew")
+
     def set_vague_search_format(self):
         """Sets a vague search format if the checkbox is selected."""
         if self.vague_search_checkbox.get() == 1:
@@ -333,7 +1025,11 @@ class App(ctk.CTk):
             "listen_port": self.listen_port_entry.get(),
             "preferred_format": self.pref_format_entry.get(),
             "accepted_format": self.format_entry.get(),
-            "search_format": self.search_format_entry.get()
+            "search_format": self.search_format_entry.get(),
+            "negative_cache_ttl": self.negative_ttl_entry.get(),
+            "nice_level": self.nice_entry.get(),
+            "io_priority": self.io_priority_optionmenu.get(),
+            "concurrent_downloads": self.concurrent_entry.get()
         }
         try:
             with open(CONFIG_FILE, "w") as f:
@@ -358,6 +1054,10 @@ class App(ctk.CTk):
                     self.format_entry.insert(0, config_data.get("accepted_format", "flac,mp3"))
                     self.listen_port_entry.insert(0, config_data.get("listen_port", ""))
                     self.search_format_entry.insert(0, config_data.get("search_format", ""))
+                    self.negative_ttl_entry.insert(0, config_data.get("negative_cache_ttl", ""))
+                    self.nice_entry.insert(0, config_data.get("nice_level", ""))
+                    self.io_priority_optionmenu.set(config_data.get("io_priority", "normal"))
+                    self.concurrent_entry.insert(0, config_data.get("concurrent_downloads", ""))
                 self.update_status("Credentials loaded from config file.", "blue")
             except Exception as e:
                 self.update_status(f"Error loading credentials: {e}", "red")
@@ -444,7 +1144,7 @@ class App(ctk.CTk):
 
     def get_spotify_playlist_tracks(self, playlist_id, access_token):
         """
-        Fetches tracks from a Spotify playlist.
+        Fetches tracks from a Spotify playlist into the track table and returns their IDs.
         """
         tracks = []
         next_url = f"{SPOTIFY_API_URL}/playlists/{playlist_id}/tracks"
@@ -463,11 +1163,7 @@ class App(ctk.CTk):
                     track = item['track']
                     if track and track['artists']:
                         artist_names = [artist['name'] for artist in track['artists']]
-                        tracks.append({
-                            'title': track['name'],
-                            'artist': ", ".join(artist_names),
-                            'album': track['album']['name']
-                        })
+                        tracks.append(self.track_table.add(track['name'], ", ".join(artist_names), track['album']['name']))
                 
                 next_url = data['next']
             except requests.exceptions.RequestException as e:
@@ -477,9 +1173,150 @@ class App(ctk.CTk):
                 return None
         return tracks
 
+    def get_expanded_source_tracks(self, url, source_type):
+        """
+        Resolves a YouTube or Bandcamp URL into tracks, using the on-disk cache when it is fresh.
+        Returns (source title, track IDs) or None to pass the URL to sldl unchanged.
+        """
+        cached = self.expansion_cache.get(url)
+        if cached:
+            title, raw_tracks = cached
+            self.print_to_output(f"Using cached track list for {url} ({len(raw_tracks)} tracks).", "blue")
+        else:
+            self.print_to_output(f"Expanding {source_type} URL into tracks...", "blue")
+            if source_type == "youtube":
+                result = self.expand_youtube_url(url)
+            else:
+                result = self.expand_bandcamp_url(url)
+            if not result or not result[1]:
+                self.print_to_output("Could not expand the URL; passing it to sldl unchanged.", "yellow")
+                return None
+            title, raw_tracks = result
+            try:
+                self.expansion_cache.put(url, title, raw_tracks)
+            except OSError as e:
+                self.print_to_output(f"Error saving expansion cache: {e}", "red")
+            self.print_to_output(f"Expanded {url} into {len(raw_tracks)} tracks.", "green")
+        
+        track_ids = [self.track_table.add(track_title, artist, album) for track_title, artist, album in raw_tracks]
+        return title, track_ids
+
+    def expand_youtube_url(self, url):
+        """
+        Lists the videos of a YouTube video, playlist or channel with yt-dlp's flat extraction.
+        Channel tabs are nested playlists and are expanded concurrently.
+        """
+        if not yt_dlp:
+            self.print_to_output("yt-dlp is not installed (pip install yt-dlp); YouTube URLs can't be expanded.", "yellow")
+            return None
+        
+        options = {"extract_flat": "in_playlist", "quiet": True, "skip_download": True, "ignoreerrors": True}
+        
+        def extract(page_url):
+            # YoutubeDL instances aren't shared between threads
+            with yt_dlp.YoutubeDL(options) as ydl:
+                return ydl.extract_info(page_url, download=False)
+        
+        try:
+            info = extract(url)
+            if not info:
+                return None
+            if info.get("entries") is None:
+                return info.get("title") or "", [self.split_video_title(info)]
+            
+            entries = [entry for entry in info["entries"] if entry]
+            nested = [entry["url"] for entry in entries if entry.get("ie_key") == "YoutubeTab" or entry.get("_type") == "playlist"]
+            videos = [entry for entry in entries if entry.get("ie_key") != "YoutubeTab" and entry.get("_type") != "playlist"]
+            if nested:
+                with ThreadPoolExecutor(max_workers=EXPANSION_WORKERS) as pool:
+                    for sub_info in pool.map(extract, nested):
+                        if sub_info:
+                            videos.extend(entry for entry in sub_info.get("entries") or [] if entry)
+        except Exception as e: # yt-dlp raises its own DownloadError/ExtractorError types
+            self.print_to_output(f"Error expanding YouTube URL: {e}", "red")
+            return None
+        
+        tracks = [self.split_video_title(video) for video in videos if video.get("title") not in ("[Deleted video]", "[Private video]")]
+        return info.get("title") or "", tracks
+
+    def split_video_title(self, video):
+        """
+        Turns a video's "Artist - Title" name into a [title, artist, album] track, falling back to the channel name.
+        """
+        title = re.sub(r'\s*[\(\[][^\)\]]*\b(?:official|lyrics?|audio|video|visuali[sz]er|hd|4k)\b[^\)\]]*[\)\]]', '', video.get("title") or "", flags=re.IGNORECASE).strip()
+        channel = video.get("channel") or video.get("uploader") or ""
+        if channel.endswith(" - Topic"):
+            channel = channel[:-len(" - Topic")]
+        if " - " in title:
+            artist, title = title.split(" - ", 1)
+            return [title.strip(), artist.strip(), ""]
+        return [title, channel, ""]
+
+    def expand_bandcamp_url(self, url):
+        """
+        Lists the tracks of a Bandcamp album or track page. Artist and label pages are expanded
+        by fetching every release they link to concurrently.
+        """
+        page = self.get_bandcamp_page(url)
+        if page is None:
+            return None
+        release = self.parse_bandcamp_release(page)
+        if release:
+            return release
+        
+        # Artist/label page: collect the linked releases in page order
+        links = list(dict.fromkeys(
+            urljoin(url, href) for href in re.findall(r'href="((?:https?://[^"]*)?/(?:album|track)/[^"?#]+)', page)
+        ))
+        if not links:
+            self.print_to_output("No Bandcamp releases found on the page.", "red")
+            return None
+        
+        with ThreadPoolExecutor(max_workers=EXPANSION_WORKERS) as pool:
+            releases = pool.map(lambda link: self.parse_bandcamp_release(self.get_bandcamp_page(link) or ""), links)
+            tracks = [track for release in releases if release for track in release[1]]
+        
+        title_match = re.search(r'<meta property="og:title" content="([^"]*)"', page)
+        title = html.unescape(title_match.group(1)) if title_match else url
+        return title, tracks
+
+    def get_bandcamp_page(self, url):
+        """
+        Downloads a Bandcamp page, returning its HTML or None on failure.
+        """
+        try:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+            return response.text
+        except requests.exceptions.RequestException as e:
+            self.print_to_output(f"Error fetching Bandcamp page {url}: {e}", "red")
+            return None
+
+    def parse_bandcamp_release(self, page):
+        """
+        Reads the track list embedded in a Bandcamp album/track page (the data-tralbum attribute).
+        Returns (release title, [[title, artist, album], ...]) or None if the page isn't a release.
+        """
+        match = re.search(r'data-tralbum="([^"]*)"', page)
+        if not match:
+            return None
+        try:
+            data = json.loads(html.unescape(match.group(1)))
+        except ValueError:
+            return None
+        
+        release_artist = data.get("artist") or ""
+        release_title = (data.get("current") or {}).get("title") or ""
+        album = release_title if data.get("item_type") == "album" else ""
+        tracks = [
+            [track["title"], track.get("artist") or release_artist, album]
+            for track in data.get("trackinfo") or [] if track.get("title")
+        ]
+        return f"{release_artist} - {release_title}", tracks
+
     def process_obscurify_csv(self, file_path):
         """
-        Reads a CSV from Obscurify and extracts artist and track information.
+        Reads a CSV from Obscurify into the track table and returns the track IDs.
         """
         tracks = []
         try:
@@ -498,11 +1335,8 @@ class App(ctk.CTk):
                 artist_name_key = next((h for h in reader.fieldnames if h.lower() == 'artist name(s)'), None)
                 
                 for row in reader:
-                    tracks.append({
-                        'title': row.get(track_name_key, ''),
-                        'artist': row.get(artist_name_key, ''),
-                        'album': '' # Obscurify CSV doesn't have album info
-                    })
+                    # Obscurify CSV doesn't have album info
+                    tracks.append(self.track_table.add(row.get(track_name_key, ''), row.get(artist_name_key, '')))
             self.print_to_output(f"Successfully loaded {len(tracks)} tracks from the CSV.", "green")
             return tracks
         except FileNotFoundError:
@@ -521,6 +1355,56 @@ class App(ctk.CTk):
         # Trim leading/trailing whitespace
         sanitized = sanitized.strip()
         return sanitized
+
+    def get_negative_cache_ttl(self):
+        """
+        Returns the not-found re-check interval in hours, falling back to the default on invalid input.
+        """
+        try:
+            return float(self.negative_ttl_entry.get()) if self.negative_ttl_entry.get() else DEFAULT_NEGATIVE_CACHE_TTL_HOURS
+        except ValueError:
+            return DEFAULT_NEGATIVE_CACHE_TTL_HOURS
+
+    def get_job_options(self):
+        """
+        Snapshots every sldl option set in the GUI, so a queued job runs with the options it was
+        prepared with even if the GUI changes before it starts.
+        """
+        options = {
+            "base_download_path": self.path_entry.get() if self.path_entry.get() else DEFAULT_DOWNLOAD_PATH,
+            "search_format": self.search_format_entry.get(),
+            "number": self.number_entry.get(),
+            "offset": self.offset_entry.get(),
+            "reverse": self.reverse_checkbox.get() == 1,
+            "write_playlist": self.write_playlist_checkbox.get() == 1,
+            "no_skip_existing": self.no_skip_existing_checkbox.get() == 1,
+            "fast_search": self.fast_search_checkbox.get() == 1,
+            "desperate": self.desperate_checkbox.get() == 1,
+            "yt_dlp": self.yt_dlp_checkbox.get() == 1,
+            "min_bitrate": self.min_bitrate_entry.get(),
+            "max_bitrate": self.max_bitrate_entry.get(),
+            "pref_format": self.pref_format_entry.get(),
+            "format": self.format_entry.get(),
+            "listen_port": self.listen_port_entry.get(),
+            "remove_from_source": self.remove_from_source_checkbox.get() == 1,
+            "negative_ttl": self.get_negative_cache_ttl()
+        }
+        options["search_signature"] = self.get_search_options_signature(options)
+        return options
+
+    def get_search_options_signature(self, options):
+        """
+        Builds a stable string from the job options that affect whether a search finds anything.
+        """
+        signature = {
+            "format": options["format"].lower(),
+            "pref_format": options["pref_format"].lower(),
+            "min_bitrate": options["min_bitrate"],
+            "max_bitrate": options["max_bitrate"],
+            "fast": options["fast_search"],
+            "desperate": options["desperate"]
+        }
+        return json.dumps(signature, sort_keys=True)
         
     def start_download(self):
         """
@@ -532,27 +1416,50 @@ class App(ctk.CTk):
             self.update_status("Please provide a Spotify URL or file path.", "red")
             return
         
-        # --- New: Reset download status lists before a new download ---
-        self.all_queries = []
-        self.downloaded_queries = set()
-        self.failed_downloads = []
-
-        self.output_text.delete("1.0", ctk.END) # Clear the log
-        self.update_status("Starting download...", "yellow")
-        self.download_button.configure(state="disabled", text="Downloading...")
+        if self.sldl_session.is_idle():
+            # --- New: Reset download status lists before a new download ---
+            self.track_table = TrackTable()
+            self.searched_ids = []
+            self.downloaded_ids = set()
+            self.failed_reasons = {}
+            self.skipped_ids = []
+            self.negative_cache = NegativeSearchCache(NEGATIVE_CACHE_FILE)
+            self.search_history = SearchHistory(SEARCH_HISTORY_FILE)
+            self.album_groups = []
+            self.track_aliases = {}
+            self.track_playlists = {}
+            self.job_cancelled = False
+            if self.profile_checkbox.get() == 1:
+                self.profiler = JobProfiler(os.path.join(PROFILE_DIR, time.strftime("job_%Y%m%d_%H%M%S")))
+                self.profiler.start()
+
+            self.output_text.delete("1.0", ctk.END) # Clear the log
+            self.update_status("Starting download...", "yellow")
+        else:
+            # A job is already running; this one waits in the queue and runs after it
+            self.print_to_output(f"\nQueued: {input_value}\n", "blue")
+            self.update_status("Job added to the queue.", "yellow")
+        self.download_button.configure(text="Queue Next Job")
         
-        # Create a thread to handle both pre-processing and the subprocess
-        download_thread = threading.Thread(target=self.prepare_and_run_download, args=(input_value,))
+        # Create a thread to handle pre-processing; the session runs the subprocess
+        cancel_generation = self.sldl_session.begin_prepare()
+        options = self.get_job_options()
+        download_thread = threading.Thread(target=self.run_profiled, args=("preprocess", self.prepare_and_run_download, input_value, options, cancel_generation), name="prepare-job")
         download_thread.start()
 
-    def prepare_and_run_download(self, input_value):
+    def prepare_and_run_download(self, input_value, options, cancel_generation):
         """
-        Determines the input type and prepares the input for sldl.exe.
+        Determines the input type, prepares the input for sldl.exe and hands the job to the session.
+        options is the snapshot from get_job_options() taken when the job was started,
+        cancel_generation the value begin_prepare() returned for it.
         """
         temp_file_path = None
+        job = None
+        playlist_title = None
+        track_ids = [] # Tracks this job searches for, used to match its sldl output
         
-        # Get the base download path, use default if empty
-        base_download_path = self.path_entry.get() if self.path_entry.get() else DEFAULT_DOWNLOAD_PATH
+        # Base download path from the job's options (default already applied)
+        base_download_path = options["base_download_path"]
         
         # Determine the input type based on the user's selection and input value
         selected_input_type = self.input_type_optionmenu.get()
@@ -566,6 +1473,8 @@ class App(ctk.CTk):
                 final_input_type = "list"
             elif "youtube.com" in input_value or "youtu.be" in input_value:
                 final_input_type = "youtube"
+            elif "bandcamp.com" in input_value:
+                final_input_type = "bandcamp"
             else:
                 # Let sldl.exe figure out a direct string search
                 final_input_type = "string"
@@ -578,6 +1487,11 @@ class App(ctk.CTk):
             # --- New logic for dynamic playlist/source folder name ---
             dynamic_download_path = base_download_path
             
+            # YouTube and Bandcamp pages are resolved into track lists when possible
+            expanded_source = None
+            if final_input_type in ["youtube", "bandcamp"] and self.expand_sources_checkbox.get() == 1:
+                expanded_source = self.get_expanded_source_tracks(input_value, final_input_type)
+            
             if final_input_type == "spotify":
                 self.print_to_output("Detected Spotify URL. Fetching tracks...", "blue")
                 
@@ -597,6 +1511,7 @@ class App(ctk.CTk):
                     sanitized_name = self.sanitize_filename(playlist_name)
                     dynamic_download_path = os.path.join(base_download_path, sanitized_name)
                     self.print_to_output(f"Creating download folder: {dynamic_download_path}", "blue")
+                playlist_title = self.sanitize_filename(playlist_name) if playlist_name else playlist_id
 
                 # Fetch tracks from Spotify
                 tracks = self.get_spotify_playlist_tracks(playlist_id, access_token)
@@ -605,8 +1520,8 @@ class App(ctk.CTk):
                     return
                 
                 # If a custom search format is specified, create a temp file
-                if self.search_format_entry.get():
-                    temp_file_path = self.generate_query_file(tracks, self.search_format_entry.get())
+                if options["search_format"]:
+                    temp_file_path, track_ids = self.generate_query_file(tracks, options["search_format"], options)
                     final_input = temp_file_path
                     final_input_type = "list"
                 else:
@@ -622,8 +1537,8 @@ class App(ctk.CTk):
                     return
                 
                 # Create a temp file with formatted queries from the CSV data
-                search_format = self.search_format_entry.get() if self.search_format_entry.get() else "{artist} {title}"
-                temp_file_path = self.generate_query_file(tracks, search_format)
+                search_format = options["search_format"] if options["search_format"] else "{artist} {title}"
+                temp_file_path, track_ids = self.generate_query_file(tracks, search_format, options)
                 final_input = temp_file_path
                 final_input_type = "list"
                 
@@ -632,6 +1547,21 @@ class App(ctk.CTk):
                 sanitized_name = self.sanitize_filename(csv_name)
                 dynamic_download_path = os.path.join(base_download_path, sanitized_name)
                 self.print_to_output(f"Creating download folder: {dynamic_download_path}", "blue")
+                playlist_title = sanitized_name
+
+            # --- Pre-expand YouTube and Bandcamp pages into per-track queries ---
+            elif expanded_source:
+                source_title, tracks = expanded_source
+                search_format = options["search_format"] if options["search_format"] else "{artist} {title}"
+                temp_file_path, track_ids = self.generate_query_file(tracks, search_format, options)
+                final_input = temp_file_path
+                final_input_type = "list"
+                
+                sanitized_name = self.sanitize_filename(source_title)
+                if sanitized_name:
+                    dynamic_download_path = os.path.join(base_download_path, sanitized_name)
+                    self.print_to_output(f"Creating download folder: {dynamic_download_path}", "blue")
+                    playlist_title = sanitized_name
 
             else:
                 # If not Spotify or CSV, use the original input
@@ -640,51 +1570,358 @@ class App(ctk.CTk):
                 
                 # If it's a direct search string or single input, store it.
                 if final_input_type in ["string", "bandcamp", "youtube"]:
-                    self.all_queries.append(final_input)
-
-            # Now, run the download command with the prepared input and dynamic path
-            self.run_download_command(final_input, final_input_type, dynamic_download_path)
+                    track_id = self.track_table.add(final_input, "")
+                    self.track_table.set_query(track_id, final_input)
+                    self.searched_ids.append(track_id)
+                    track_ids = [track_id]
+
+            # Every query may have been skipped (generate_query_file reports why)
+            if final_input_type == "list" and temp_file_path and os.path.getsize(temp_file_path) == 0:
+                return
+
+            # Keep the source playlist's M3U up to date ourselves when we know its tracks
+            if playlist_title and temp_file_path and options["write_playlist"]:
+                self.create_playlist_writer(playlist_title, dynamic_download_path, tracks)
+                options["write_playlist"] = False # Don't let sldl write its own playlist too
+
+            # sldl's --reverse would undo the history ordering of a generated query file
+            if options["reverse"] and temp_file_path and self.history_order_checkbox.get() == 1:
+                options["reverse"] = False
+                self.print_to_output("'Reverse Order' is ignored because 'Likely Hits First' already orders the queries.", "yellow")
+
+            # Hand the prepared input and dynamic path to the session
+            job = {
+                "source": input_value, # What the user entered, for messages
+                "input": final_input,
+                "input_type": final_input_type,
+                "download_path": dynamic_download_path,
+                "temp_file": temp_file_path,
+                "track_ids": track_ids,
+                "options": options,
+                "cancel_generation": cancel_generation
+            }
 
         except Exception as e:
             self.update_status(f"An error occurred during pre-processing: {e}", "red")
         finally:
-            # Clean up the temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.remove(temp_file_path)
-                    self.print_to_output(f"Cleaned up temporary file: {temp_file_path}", "blue")
-                except OSError as e:
-                    self.print_to_output(f"Error cleaning up temporary file: {e}", "red")
-            
-            # --- New: Display a summary of missing songs after the download finishes ---
-            self.display_download_summary()
+            # The session deletes the temp file after the run; clean up here only if nothing was queued
+            if not job:
+                self.remove_temp_file(temp_file_path)
+            self.sldl_session.end_prepare(job)
+
+    def run_session_batch(self, jobs):
+        """
+        Runs one or more queued jobs as a single sldl process.
+        Query jobs are merged into one list file so they share a login.
+        """
+        temp_files = [job["temp_file"] for job in jobs if job["temp_file"]]
+        try:
+            if len(jobs) == 1:
+                job = jobs[0]
+                self.run_profiled("sldl_run", self.run_download_command, job["input"], job["input_type"], job["download_path"], job["options"], job["track_ids"])
+                return
+
+            merged_file_path = self.new_temp_file_path()
+            temp_files.append(merged_file_path)
+            with open(merged_file_path, "w", encoding="utf-8") as merged:
+                for job in jobs:
+                    if job["input_type"] == "list":
+                        with open(job["input"], "r", encoding="utf-8") as f:
+                            for line in f:
+                                if line.strip():
+                                    merged.write(line.rstrip("\n") + "\n")
+                    else:
+                        merged.write('"' + job["input"].replace('"', '') + '"\n')
+            self.print_to_output(f"Merged {len(jobs)} queued jobs into one sldl run.", "blue")
+            # All jobs in a batch have identical options
+            track_ids = [track_id for job in jobs for track_id in job["track_ids"]]
+            self.run_profiled("sldl_run", self.run_download_command, merged_file_path, "list", jobs[0]["download_path"], jobs[0]["options"], track_ids)
+        finally:
+            for temp_file_path in temp_files:
+                self.remove_temp_file(temp_file_path)
+
+    def finish_session(self):
+        """
+        Called once the session has no more work: saves caches, shows the summary and resets the button.
+        """
+        # Persist not-found results so the next run can skip them
+        if self.negative_cache:
+            try:
+                self.negative_cache.save()
+            except OSError as e:
+                self.print_to_output(f"Error saving negative search cache: {e}", "red")
+        if self.search_history:
+            try:
+                self.search_history.save()
+            except OSError as e:
+                self.print_to_output(f"Error saving search history: {e}", "red")
+        
+        # --- New: Display a summary of missing songs after the download finishes ---
+        self.run_profiled("summary", self.display_download_summary)
+        self.download_button.configure(state="normal", text="Start Download")
+        self.stop_profiler()
+
+    def run_profiled(self, phase_name, func, *args):
+        """
+        Runs func as a named profiling phase if the current job is profiled, otherwise just runs it.
+        """
+        profiler = self.profiler
+        if profiler:
+            return profiler.run_phase(phase_name, func, *args)
+        return func(*args)
+
+    def stop_profiler(self):
+        """
+        Finishes a profiled job and writes the job log next to its profile files.
+        """
+        profiler = self.profiler
+        if not profiler:
+            return
+        self.profiler = None
+        try:
+            profiler.stop()
+            with open(os.path.join(profiler.output_dir, "job.log"), "w", encoding="utf-8") as f:
+                f.write(self.output_text.get("1.0", ctk.END))
+            self.print_to_output(f"Profile saved to: {os.path.abspath(profiler.output_dir)}\n", "blue")
+        except OSError as e:
+            self.print_to_output(f"Error saving profile: {e}\n", "red")
+
+    def create_playlist_writer(self, playlist_title, download_path, track_ids):
+        """
+        Creates the M3U8 writer for a source playlist and links each of its tracks to it.
+        """
+        keys = [self.get_playlist_key(track_id) for track_id in track_ids]
+        playlist_path = os.path.join(download_path, f"{playlist_title}.m3u8")
+        try:
+            writer = PlaylistWriter(playlist_path, keys)
+        except (OSError, UnicodeDecodeError) as e:
+            self.print_to_output(f"Error reading existing playlist '{playlist_path}': {e}", "red")
+            return
+        for track_id in track_ids:
+            self.track_playlists[track_id] = writer
+        self.print_to_output(f"Playlist will be kept up to date at: {playlist_path} ({len(writer.entries)} tracks already listed)", "blue")
+
+    def get_playlist_key(self, track_id):
+        """
+        Returns the key that identifies a track in its playlist across runs.
+        """
+        return normalize_text(f"{self.track_table.artists[track_id]} - {self.track_table.titles[track_id]}")
+
+    def add_to_playlist(self, track_id, file_path):
+        """
+        Adds a confirmed track to its source playlist, if it has one.
+        """
+        writer = self.track_playlists.get(track_id)
+        if not writer:
+            return
+        display_name = f"{self.track_table.artists[track_id]} - {self.track_table.titles[track_id]}"
+        try:
+            writer.confirm(self.get_playlist_key(track_id), display_name, file_path)
+        except OSError as e:
+            self.after(0, self.print_to_output, f"Error updating playlist: {e}\n")
 
-    def generate_query_file(self, tracks, search_format):
+    def new_temp_file_path(self):
+        """
+        Returns a unique temporary query file name so queued jobs don't overwrite each other.
+        """
+        self.temp_file_counter += 1
+        return f"temp_queries_{os.getpid()}_{self.temp_file_counter}.txt"
+
+    def remove_temp_file(self, temp_file_path):
+        """
+        Deletes a temporary query file if it exists.
+        """
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+                self.print_to_output(f"Cleaned up temporary file: {temp_file_path}", "blue")
+            except OSError as e:
+                self.print_to_output(f"Error cleaning up temporary file: {e}", "red")
+
+    def generate_query_file(self, track_ids, search_format, options):
         """
         Generates a temporary file with formatted search queries.
+        options is the job's option snapshot, used for the not-found cache lookups.
+        Returns the file path and the IDs of the tracks actually searched.
         """
-        temp_file_path = "temp_queries.txt"
+        table = self.track_table
+        queued = []
+        query_ids = {} # Query -> first track in this job that uses it
+        duplicate_count = 0
+        for track_id in track_ids:
+            query = search_format.format(artist=table.artists[track_id], title=table.titles[track_id], album=table.albums[track_id])
+            table.set_query(track_id, query)
+            
+            # Skip queries that recently returned nothing with the same search options
+            if self.negative_cache and self.negative_cache.is_suppressed(query, options["search_signature"], options["negative_ttl"]):
+                self.skipped_ids.append(track_id)
+                self.print_to_output(f"Skipping known-missing query: {query}", "grey")
+                continue
+            
+            # The same track listed twice in this job only needs one search; the duplicate shares its outcome
+            first_id = query_ids.setdefault(query, track_id)
+            if first_id != track_id:
+                self.track_aliases.setdefault(first_id, []).append(track_id)
+                duplicate_count += 1
+                continue
+            queued.append(track_id)
+        
+        if duplicate_count:
+            self.print_to_output(f"Searching {duplicate_count} duplicate tracks only once.", "grey")
+        if not queued:
+            self.update_status("All tracks are known-missing; nothing to search.", "yellow")
+        
+        # Replace runs of tracks from the same album with one album-level search
+        album_searches = []
+        if self.album_group_checkbox.get() == 1:
+            queued, album_searches = self.group_album_queries(queued)
+        
+        # Album searches go first by default since each one can complete several tracks
+        searches = list(album_searches)
+        searches.extend((None, [track_id]) for track_id in queued)
+        
+        # Put likely quick hits first and probable misses last (stable for equal scores).
+        # An album search scores as the average of the tracks it stands in for.
+        if self.history_order_checkbox.get() == 1 and self.search_history:
+            def search_score(search):
+                member_ids = search[1]
+                scores = [self.search_history.score(table.queries[track_id], table.artists[track_id]) for track_id in member_ids]
+                return sum(scores) / len(scores)
+            searches.sort(key=search_score, reverse=True)
+            self.print_to_output("Ordered queries by past search outcomes.", "blue")
+        
+        temp_file_path = self.new_temp_file_path()
         with open(temp_file_path, "w", encoding="utf-8") as f:
-            for track in tracks:
-                query = search_format.format(artist=track['artist'], title=track['title'], album=track['album'])
+            for album_line, member_ids in searches:
+                if album_line:
+                    self.print_to_output(f"Generated album query: {album_line}", "grey")
+                    f.write(album_line + "\n")
+                    continue
                 
-                # Store the original query to track it later
-                self.all_queries.append(query)
+                track_id = member_ids[0]
+                # Store the track ID to track it later
+                self.searched_ids.extend(self.with_aliases(track_id))
                 
                 # Remove any double quotes from the query string to prevent parsing issues
-                cleaned_query = query.replace('"', '')
+                cleaned_query = table.queries[track_id].replace('"', '')
                 
                 # Wrap the cleaned query in double quotes
                 quoted_query = f'"{cleaned_query}"'
                 
                 self.print_to_output(f"Generated query: {quoted_query}", "grey")
                 f.write(quoted_query + "\n")
-        return temp_file_path
+        return temp_file_path, [track_id for _, member_ids in searches for track_id in member_ids]
+
+    def with_aliases(self, track_id):
+        """
+        Returns the track ID followed by the IDs of the duplicates searched along with it.
+        """
+        return [track_id] + self.track_aliases.get(track_id, [])
+
+    def get_album_group_min_tracks(self):
+        """
+        Returns the minimum number of tracks an album needs before it is searched as a whole.
+        """
+        value = self.album_group_entry.get()
+        if value.isdigit() and int(value) >= 2:
+            return int(value)
+        return DEFAULT_ALBUM_GROUP_MIN_TRACKS
 
-    def run_download_command(self, input_value, input_type, download_path):
+    def group_album_queries(self, queued):
+        """
+        Splits track IDs into the ones still searched per track and (sldl album-mode list line,
+        member track IDs) pairs for every artist/album shared by enough tracks. Member tracks
+        stay in searched_ids so the summary still reports them individually.
+        """
+        table = self.track_table
+        min_tracks = self.get_album_group_min_tracks()
+        albums = {}
+        for track_id in queued:
+            if table.albums[track_id] and table.artists[track_id]:
+                # Keys are normalized exactly like the album line so failed searches can be recognised
+                key = (normalize_text(self.album_search_field(table.artists[track_id])),
+                       normalize_text(self.album_search_field(table.albums[track_id])))
+                albums.setdefault(key, []).append(track_id)
+        
+        grouped_ids = set()
+        album_searches = []
+        for (artist_key, album_key), members in albums.items():
+            if len(members) < min_tracks:
+                continue
+            artist = self.album_search_field(table.artists[members[0]])
+            album = self.album_search_field(table.albums[members[0]])
+            # "a:" makes sldl treat the line as an album download
+            album_searches.append((f'a:"artist={artist},album={album}"', members))
+            self.album_groups.append({
+                "artist": artist_key,
+                "album": album_key,
+                "tracks": {normalize_text(table.titles[track_id]): track_id for track_id in members}
+            })
+            grouped_ids.update(members)
+            self.searched_ids.extend(alias_id for track_id in members for alias_id in self.with_aliases(track_id))
+        
+        if album_searches:
+            self.print_to_output(f"Grouped {len(grouped_ids)} tracks into {len(album_searches)} album searches.", "blue")
+        return [track_id for track_id in queued if track_id not in grouped_ids], album_searches
+
+    def album_search_field(self, text):
+        """
+        Cleans an artist or album name for an sldl "artist=...,album=..." property string.
+        """
+        return text.replace('"', '').replace(',', ' ')
+
+    def match_downloaded_track(self, cleaned_filename, track_ids):
+        """
+        Maps a downloaded file name back to the ID of the track it satisfies, or None.
+        Only the tracks searched by the current run (track_ids) are considered.
+        Album downloads are matched by track title since their file names rarely match the query.
+        """
+        # Find the corresponding query in our list (case-insensitive)
+        needle = cleaned_filename.lower()
+        for track_id in track_ids:
+            if track_id not in self.downloaded_ids and needle in self.track_table.queries[track_id].lower():
+                return track_id
+        
+        # Album files: the whole title must appear as words, with or without the leading track number
+        # (the number may belong to the title, as in "7 Rings").
+        # The longest matching title wins so "One" doesn't take the file of "One More Time".
+        normalized_filename = normalize_text(cleaned_filename)
+        candidate_names = (TRACK_NUMBER_PREFIX.sub('', normalized_filename), normalized_filename)
+        best_id = None
+        best_length = 0
+        for group in self.album_groups:
+            for title, track_id in group["tracks"].items():
+                if not title or len(title) <= best_length or track_id in self.downloaded_ids or track_id not in track_ids:
+                    continue
+                pattern = r'(?<!\w)' + re.escape(title) + r'(?!\w)'
+                if any(re.search(pattern, name) for name in candidate_names):
+                    best_id = track_id
+                    best_length = len(title)
+        return best_id
+
+    def find_album_group(self, failed_query, track_ids):
+        """
+        Returns the album group of the current run (track_ids) a "No files found" line refers to, or None.
+        """
+        normalized = normalize_text(failed_query)
+        for group in self.album_groups:
+            if any(track_id not in track_ids for track_id in group["tracks"].values()):
+                continue
+            if group["album"] in normalized and group["artist"] in normalized:
+                return group
+        return None
+
+    def run_download_command(self, input_value, input_type, download_path, options, track_ids):
         """
         Builds and executes the sldl.exe command in a subprocess.
+        options is the job's snapshot from get_job_options(), as stored when it was queued.
+        track_ids are the tracks searched by this run; output lines are only matched against them.
         """
+        # Queries are only unique within a job, so a merged run can map one query to several tracks
+        run_queries = {}
+        for track_id in track_ids:
+            run_queries.setdefault(self.track_table.queries[track_id], []).append(track_id)
+        track_ids = set(track_ids)
         try:
             command = [SLDL_EXECUTABLE]
             
@@ -707,47 +1944,52 @@ class App(ctk.CTk):
             if download_path:
                 command.extend(["--path", download_path])
             
-            if self.number_entry.get():
-                command.extend(["--number", self.number_entry.get()])
+            if options["number"]:
+                command.extend(["--number", options["number"]])
                 
-            if self.offset_entry.get():
-                command.extend(["--offset", self.offset_entry.get()])
+            if options["offset"]:
+                command.extend(["--offset", options["offset"]])
 
-            if self.reverse_checkbox.get() == 1:
+            if options["reverse"]:
                 command.append("--reverse")
             
-            if self.write_playlist_checkbox.get() == 1:
+            if options["write_playlist"]:
                 command.append("--write-playlist")
                 
-            if self.no_skip_existing_checkbox.get() == 1:
+            if options["no_skip_existing"]:
                 command.append("--no-skip-existing")
             
             # Search options
-            if self.fast_search_checkbox.get() == 1:
+            if options["fast_search"]:
                 command.append("--fast-search")
             
-            if self.desperate_checkbox.get() == 1:
+            if options["desperate"]:
                 command.append("--desperate")
             
-            if self.yt_dlp_checkbox.get() == 1:
+            if options["yt_dlp"]:
                 command.append("--yt-dlp")
             
-            if self.min_bitrate_entry.get():
-                command.extend(["--min-bitrate", self.min_bitrate_entry.get()])
+            if options["min_bitrate"]:
+                command.extend(["--min-bitrate", options["min_bitrate"]])
             
-            if self.max_bitrate_entry.get():
-                command.extend(["--max-bitrate", self.max_bitrate_entry.get()])
+            if options["max_bitrate"]:
+                command.extend(["--max-bitrate", options["max_bitrate"]])
                 
             # Add preferred and accepted formats
-            if self.pref_format_entry.get():
-                command.extend(["--pref-format", self.pref_format_entry.get()])
+            if options["pref_format"]:
+                command.extend(["--pref-format", options["pref_format"]])
                 
-            if self.format_entry.get():
-                command.extend(["--format", self.format_entry.get()])
+            if options["format"]:
+                command.extend(["--format", options["format"]])
             
-            listen_port = self.listen_port_entry.get()
+            listen_port = options["listen_port"]
             if listen_port and listen_port.isdigit():
                 command.extend(["--listen-port", listen_port])
+            
+            # sldl has no bandwidth option, so throughput is capped via its concurrent download count
+            _, _, concurrent_downloads = self.get_process_limits()
+            if concurrent_downloads:
+                command.extend(["--concurrent-downloads", str(concurrent_downloads)])
 
             # Spotify options are now handled by the GUI to fetch the data
             # so we don't need to pass them to slsk-batchdl unless it's a direct Spotify input
@@ -757,7 +1999,7 @@ class App(ctk.CTk):
                 if self.spotify_secret_entry.get():
                     command.extend(["--spotify-secret", self.spotify_secret_entry.get()])
                 
-                if self.remove_from_source_checkbox.get() == 1:
+                if options["remove_from_source"]:
                     command.append("--remove-from-source")
             
             self.print_to_output(f"Executing command: {' '.join(command)}\n", "blue")
@@ -770,8 +2012,17 @@ class App(ctk.CTk):
                 encoding='utf-8',
                 errors='replace',
                 bufsize=1,
-                creationflags=subprocess.CREATE_NO_WINDOW
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
             )
+            
+            # Keep a handle so the job can be paused, resumed or cancelled from the GUI
+            managed_process = ManagedProcess(process)
+            self.current_process = managed_process
+            self.pause_button.configure(state="normal", text="Pause")
+            self.cancel_button.configure(state="normal")
+            threading.Thread(target=self.enforce_process_limits, args=(managed_process,), daemon=True).start()
+
+            self.last_outcome_time = time.time()
 
             # --- Process output line by line to track downloads ---
             for line in process.stdout:
@@ -784,19 +2035,36 @@ class App(ctk.CTk):
                         filename_with_ext = parts[1].strip()
                         cleaned_filename = os.path.splitext(filename_with_ext)[0]
                         
-                        # Find the corresponding query in our list (case-insensitive)
-                        for original_query in self.all_queries:
-                            if cleaned_filename.lower() in original_query.lower():
-                                self.downloaded_queries.add(original_query)
-                                break
+                        track_id = self.match_downloaded_track(cleaned_filename, track_ids)
+                        if track_id is not None:
+                            if self.negative_cache:
+                                self.negative_cache.record_hit(self.track_table.queries[track_id], options["search_signature"])
+                            self.record_search_outcome(track_id, True)
+                            for alias_id in self.with_aliases(track_id):
+                                self.downloaded_ids.add(alias_id)
+                                self.add_to_playlist(alias_id, line_stripped.split(':', 1)[1].strip())
                 elif "No files found for" in line_stripped:
                     try:
                         query_start = line_stripped.find("'") + 1
                         query_end = line_stripped.rfind("'")
                         failed_query = line_stripped[query_start:query_end]
-                        # Only add to failed_downloads if it hasn't been downloaded/skipped
-                        if failed_query not in self.downloaded_queries:
-                            self.failed_downloads.append((failed_query, "No files found"))
+                        query_ids = run_queries.get(failed_query, [])
+                        album_group = None if query_ids else self.find_album_group(failed_query, track_ids)
+                        # Only add to failed_reasons if it hasn't been downloaded/skipped
+                        if album_group:
+                            # An album search failing says little about each track, so don't cache it
+                            for member_id in album_group["tracks"].values():
+                                for alias_id in self.with_aliases(member_id):
+                                    if alias_id not in self.downloaded_ids:
+                                        self.failed_reasons[alias_id] = "No files found (album search)"
+                        else:
+                            failed_ids = [track_id for track_id in query_ids if track_id not in self.downloaded_ids]
+                            if self.negative_cache and (failed_ids or not query_ids):
+                                self.negative_cache.record_miss(failed_query, options["search_signature"], options["negative_ttl"])
+                            for track_id in failed_ids:
+                                self.record_search_outcome(track_id, False)
+                                for alias_id in self.with_aliases(track_id):
+                                    self.failed_reasons[alias_id] = "No files found"
                     except IndexError:
                         pass
                 
@@ -804,7 +2072,9 @@ class App(ctk.CTk):
                 
             process.wait()
             
-            if process.returncode == 0:
+            if managed_process.cancelled:
+                self.update_status("Download cancelled. Partial results are kept.", "yellow")
+            elif process.returncode == 0:
                 self.update_status("Download finished successfully!", "green")
             else:
                 self.update_status(f"Download failed with exit code {process.returncode}.", "red")
@@ -814,7 +2084,85 @@ class App(ctk.CTk):
         except Exception as e:
             self.update_status(f"An error occurred: {e}", "red")
         finally:
-            self.download_button.configure(state="normal", text="Start Download")
+            self.current_process = None
+            self.pause_button.configure(state="disabled", text="Pause")
+            self.cancel_button.configure(state="disabled")
+
+    def get_process_limits(self):
+        """
+        Returns (nice level, I/O priority, max concurrent downloads) for the current time of day.
+        When limits are restricted to business hours, they are dropped outside them.
+        """
+        if self.business_hours_checkbox.get() == 1:
+            now = time.localtime()
+            in_business_hours = now.tm_wday < 5 and BUSINESS_HOURS[0] <= now.tm_hour < BUSINESS_HOURS[1]
+            if not in_business_hours:
+                return 0, "normal", None
+        nice_value = self.nice_entry.get()
+        nice_level = min(int(nice_value), 19) if nice_value.isdigit() else 0
+        concurrent_value = self.concurrent_entry.get()
+        concurrent_downloads = int(concurrent_value) if concurrent_value.isdigit() and int(concurrent_value) > 0 else None
+        return nice_level, self.io_priority_optionmenu.get(), concurrent_downloads
+
+    def enforce_process_limits(self, managed_process):
+        """
+        Applies the CPU and I/O limits to a running process and re-applies them as the time of day changes.
+        The concurrent download cap is a command-line flag, so it only changes with the next job.
+        """
+        while managed_process.is_running():
+            nice_level, io_priority, _ = self.get_process_limits()
+            error = managed_process.apply_limits(nice_level, io_priority)
+            if error:
+                self.after(0, self.print_to_output, error + "\n")
+            time.sleep(PROCESS_LIMITS_CHECK_INTERVAL)
+
+    def toggle_pause(self):
+        """
+        Pauses or resumes the running sldl process.
+        """
+        managed_process = self.current_process
+        if not managed_process:
+            return
+        try:
+            if managed_process.paused:
+                if managed_process.resume():
+                    self.pause_button.configure(text="Pause")
+                    self.update_status("Download resumed.", "yellow")
+            elif managed_process.pause():
+                self.pause_button.configure(text="Resume")
+                self.update_status("Download paused.", "yellow")
+            else:
+                self.update_status("Pausing is not supported here (install psutil).", "red")
+        except Exception as e:
+            self.update_status(f"Error pausing or resuming download: {e}", "red")
+
+    def cancel_download(self):
+        """
+        Stops the running sldl process and drops queued jobs. Results parsed so far still show in the summary.
+        """
+        self.job_cancelled = True
+        self.sldl_session.cancel()
+        if self.current_process:
+            self.current_process.cancel()
+        self.update_status("Cancelling download...", "yellow")
+
+    def discard_job(self, job):
+        """
+        Reports a job dropped by a cancel and removes its temp file.
+        """
+        self.print_to_output(f"Dropped by cancel: {job['source']} (not downloaded)\n", "yellow")
+        self.remove_temp_file(job["temp_file"])
+
+    def record_search_outcome(self, track_id, found):
+        """
+        Adds a parsed result to the search history. Time to find is measured from the previous
+        result line, which is an approximation when sldl downloads several files concurrently.
+        """
+        now = time.time()
+        elapsed = now - self.last_outcome_time if self.last_outcome_time else None
+        self.last_outcome_time = now
+        if self.search_history:
+            self.search_history.record(self.track_table.queries[track_id], self.track_table.artists[track_id], found, elapsed)
 
     def display_download_summary(self):
         """
@@ -824,22 +2172,24 @@ class App(ctk.CTk):
         self.print_to_output("DOWNLOAD SUMMARY", "white")
         self.print_to_output("="*50 + "\n", "white")
 
-        # Use a set difference for efficient comparison
-        all_queries_set = set(self.all_queries)
-        not_downloaded_set = all_queries_set - self.downloaded_queries
+        queries = self.track_table.queries
+        not_downloaded = [track_id for track_id in self.searched_ids if track_id not in self.downloaded_ids]
 
-        if not_downloaded_set:
-            self.print_to_output(f"Failed to find or download {len(not_downloaded_set)} out of {len(self.all_queries)} songs:", "red")
+        if not_downloaded:
+            self.print_to_output(f"Failed to find or download {len(not_downloaded)} out of {len(self.searched_ids)} songs:", "red")
             
-            # Create a dictionary to map failed queries to reasons
-            failed_queries_with_reasons = {query: reason for query, reason in self.failed_downloads}
-            
-            for query in sorted(list(not_downloaded_set)):
-                reason = failed_queries_with_reasons.get(query, "Unknown reason (e.g., download failed, file too small, etc.).")
-                self.print_to_output(f"  - {query} (Reason: {reason})", "red")
+            default_reason = "Job cancelled" if self.job_cancelled else "Unknown reason (e.g., download failed, file too small, etc.)."
+            for track_id in sorted(not_downloaded, key=lambda track_id: queries[track_id]):
+                reason = self.failed_reasons.get(track_id, default_reason)
+                self.print_to_output(f"  - {queries[track_id]} (Reason: {reason})", "red")
                 
         else:
-            self.print_to_output(f"All {len(self.all_queries)} songs were successfully downloaded or skipped!", "green")
+            self.print_to_output(f"All {len(self.searched_ids)} songs were successfully downloaded or skipped!", "green")
+
+        if self.skipped_ids:
+            self.print_to_output(f"\nNot searched: {len(self.skipped_ids)} songs are still inside their not-found re-check interval:", "grey")
+            for query in sorted(queries[track_id] for track_id in self.skipped_ids):
+                self.print_to_output(f"  - {query}", "grey")
 
         self.print_to_output("\n" + "="*50 + "\n", "white")
 
@@ -867,5 +2217,11 @@ class App(ctk.CTk):
         webbrowser.open(SLSK_URL)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soulseek Batch Downloader")
+    parser.add_argument("--profile", action="store_true", help="Profile every job (cProfile and tracemalloc)")
+    args, _ = parser.parse_known_args()
+
     app = App()
+    if args.profile:
+        app.profile_checkbox.select()
     app.mainloop()
\ No newline at end of file